@@ -0,0 +1,202 @@
+"""
+原始数据存档与离线重解析
+	--author:7OZP1K
+"""
+import argparse, json, os, struct, zlib
+from concurrent.futures import ProcessPoolExecutor
+from DrissionPage.common import make_session_ele
+from record import RecordWriter
+
+# 每条记录: 魔数 + 4字节长度 + 4字节CRC32 + zlib(头部JSON + '\n' + 原始文本)
+MAGIC = b'JDA1'
+FRAME = struct.Struct('>4sII')
+# 超过该长度的帧头视为损坏(正常帧是单页源码，远小于此)
+MAX_FRAME = 64 << 20
+
+
+class CaptureArchive:
+    """只追加的压缩存档，按 (关键词, 页码, 来源) 保存接口原文或页面源码
+
+    scraper 记录是哪个采集器写的(jd / jd2)，重解析时用对应的解析器。
+    """
+
+    def __init__(self, filename, scraper):
+        self.filename = filename
+        self.scraper = scraper
+        self.failed = False
+
+    def append(self, kw, page, source, ts, body):
+        if not body:
+            return
+        head = json.dumps({'scraper': self.scraper, 'kw': kw, 'page': page,
+                           'source': source, 'ts': ts}, ensure_ascii=False)
+        data = zlib.compress(f"{head}\n{body}".encode('utf-8'), 6)
+        try:
+            with open(self.filename, 'ab') as f:
+                f.write(FRAME.pack(MAGIC, len(data), zlib.crc32(data)) + data)
+        except OSError as e:
+            # 存档失败不影响采集，只提示一次
+            if not self.failed:
+                self.failed = True
+                print(f"\n[存档写入失败，本次运行的原始数据不完整] {e}")
+
+    def append_page(self, kw, page, source, ts, last_body, get_html):
+        """按采集来源存档一页：API取接口原文，DOM/源码来源取页面源码
+
+        source 为采集器显示的来源文字(含"DOM"的都算DOM来源)；
+        get_html 只在需要页面源码时调用，避免API页白白读取整页源码。
+        """
+        if source == 'API' and last_body:
+            self.append(kw, page, 'API', ts, last_body)
+            return
+        try:
+            html = get_html()
+        except Exception:
+            return
+        # DOM来源离线用静态元素走DOM解析分支，源码来源走正则分块
+        self.append(kw, page, 'DOM' if 'DOM' in source else 'HTML', ts, html)
+
+
+def _resync(f, start):
+    """从start开始查找下一个魔数并定位到该处，找不到返回False"""
+    f.seek(start)
+    tail = b''
+    while True:
+        chunk = f.read(1 << 16)
+        if not chunk:
+            return False
+        buf = tail + chunk
+        i = buf.find(MAGIC)
+        if i >= 0:
+            f.seek(f.tell() - len(buf) + i)
+            return True
+        tail = buf[-(len(MAGIC) - 1):]
+
+
+def iter_frames(filename):
+    """逐条读取压缩帧(不解压)
+
+    魔数、长度或CRC不对的位置产出一个None表示损坏，然后跳到下一个魔数继续，
+    一处写坏(如断电截断)不会影响后面的帧。
+    """
+    with open(filename, 'rb') as f:
+        while True:
+            pos = f.tell()
+            head = f.read(FRAME.size)
+            if not head:
+                return
+            if len(head) == FRAME.size:
+                magic, size, crc = FRAME.unpack(head)
+                if magic == MAGIC and size <= MAX_FRAME:
+                    data = f.read(size)
+                    if len(data) == size and zlib.crc32(data) == crc:
+                        yield data
+                        continue
+            yield None
+            if not _resync(f, pos + 1):
+                return
+
+
+def _windows(frames, size):
+    window = []
+    for frame in frames:
+        window.append(frame)
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+_parsers = {}
+
+
+def _get_parser(name):
+    """每个进程只构建一次不启动浏览器的解析器"""
+    if name not in _parsers:
+        if name == 'jd2':
+            from jd2 import AutoPartsScraper
+            scraper = AutoPartsScraper(browser=False)
+            parse = scraper._parse_item_nuclear
+        else:
+            from jd import JDProductScraper
+            scraper = JDProductScraper(browser=False)
+            parse = scraper._parse_item_universal
+        _parsers[name] = (scraper, parse)
+    return _parsers[name]
+
+
+def parse_frame(data):
+    """解析一帧，返回商品列表；损坏的帧返回None"""
+    if data is None:
+        return None
+    try:
+        head, body = zlib.decompress(data).decode('utf-8').split('\n', 1)
+        head = json.loads(head)
+    except (zlib.error, UnicodeDecodeError, ValueError):
+        return None
+    scraper, parse = _get_parser(head['scraper'])
+    if head['source'] == 'API':
+        raw_items = scraper.capture.parse_wares(body)
+    elif head['source'] == 'DOM':
+        # 静态元素与页面元素同样支持 .ele/.attr/.text，解析器走原来的DOM分支
+        # (离线无法按元素尺寸过滤不可见商品)
+        raw_items = make_session_ele(body).eles('@data-sku')
+    else:
+        raw_items = scraper._split_chunks(body)
+    products = []
+    for i, item in enumerate(raw_items, 1):
+        p = parse(item, head['kw'], head['page'], i, head['ts'])
+        if p:
+            products.append(p)
+    return products
+
+
+def reparse(archive_files, output_file, workers=None, batch=5000, window=1024):
+    """从一个或多个存档(如队列模式各节点的存档)重建CSV，多进程并行解析，不需要浏览器"""
+    if isinstance(archive_files, str):
+        archive_files = [archive_files]
+    missing = [p for p in archive_files if not os.path.exists(p)]
+    if missing or not archive_files:
+        print(f"存档不存在: {missing}")
+        return 0
+    if os.path.exists(output_file):
+        print(f"输出文件已存在，请先移走: {output_file}")
+        return 0
+
+    writer = RecordWriter(output_file)
+    writer.write([])
+    pages = 0
+    count = 0
+    skipped = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        buf = []
+        # 分窗口提交，避免一次把整个存档读进内存
+        frames_iter = (frame for path in archive_files for frame in iter_frames(path))
+        for frames in _windows(frames_iter, window):
+            for products in executor.map(parse_frame, frames, chunksize=16):
+                if products is None:
+                    skipped += 1
+                    continue
+                pages += 1
+                buf.extend(products)
+                if len(buf) >= batch:
+                    writer.write(buf)
+                    count += len(buf)
+                    buf = []
+                    print(f"\r已解析: {pages}页 | {count}条", end="")
+        if buf:
+            writer.write(buf)
+            count += len(buf)
+
+    print(f"\n重解析完成: {pages}页 -> {count}条 | 跳过损坏帧: {skipped} | {output_file}")
+    return count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='从原始数据存档离线重建CSV')
+    parser.add_argument('output')
+    parser.add_argument('archive', nargs='+')
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+    reparse(args.archive, args.output, workers=args.workers)
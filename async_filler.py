@@ -0,0 +1,86 @@
+"""
+异步数据补全(httpx)
+	--author:7OZP1K
+"""
+import asyncio, csv
+from jd import SummaryFiller
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncFiller(SummaryFiller):
+    """单进程协程补全：连接池与并发数一致，可选HTTP/2，断点续跑规则与多线程版相同"""
+
+    def __init__(self, concurrency=200, http2=False, timeout=5):
+        super().__init__(concurrency)
+        self.http2 = http2
+        self.timeout = timeout
+
+    async def process_item_async(self, client, row):
+        sku, has_score, has_sales = self._missing(row)
+        if not sku:
+            return None
+
+        try:
+            params = {'referenceIds': sku}
+            resp = await client.get(self.SUMMARY_URL, params=params, timeout=self.timeout)
+            return self._apply_summary(row, resp.json(), has_score, has_sales)
+        except Exception:
+            # 不能用裸except：会吞掉CancelledError，中断后剩余任务被当作未补全写入
+            return None
+
+    def _client(self):
+        limits = httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers)
+        try:
+            return httpx.AsyncClient(headers=self.HEADERS, limits=limits, http2=self.http2, timeout=self.timeout)
+        except ImportError:
+            print("未安装h2，改用HTTP/1.1 (pip install httpx[http2])")
+            return httpx.AsyncClient(headers=self.HEADERS, limits=limits, timeout=self.timeout)
+
+    async def _run(self, record_writer, tasks):
+        count = 0
+        success = 0
+        pending = iter(tasks)
+
+        with open(record_writer.filename, 'a', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+
+            async def worker(client):
+                nonlocal count, success
+                for row in pending:
+                    result_row = await self.process_item_async(client, row)
+                    row_to_save = result_row if result_row else row
+                    count += 1
+                    self._write_row(writer, record_writer, row_to_save)
+
+                    if result_row:
+                        success += 1
+
+                    if count % 50 == 0:
+                        f.flush()
+                        print(f"\r进度: {count}/{len(tasks)} | 成功补全: {success}", end="")
+
+            async with self._client() as client:
+                await asyncio.gather(*[worker(client) for _ in range(min(self.workers, len(tasks)))])
+
+        return success
+
+    def run(self, csv_file, output_file):
+        if httpx is None:
+            print("异步补全需要 httpx: pip install httpx")
+            return
+
+        print(f"\n启动异步补全 ({self.workers}并发{', HTTP/2' if self.http2 else ''})...")
+        prepared = self._prepare(csv_file, output_file)
+        if not prepared:
+            return
+        record_writer, tasks = prepared
+
+        print(f"开始并发处理 {len(tasks)}条任务...")
+        success = asyncio.run(self._run(record_writer, tasks))
+
+        print(f"\n\n全部完成！成功补全: {success}条")
+        print(f"结果保存至: {output_file}")
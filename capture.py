@@ -0,0 +1,102 @@
+"""
+数据包捕获层
+	--author:7OZP1K
+"""
+import json, re
+from urllib.parse import urlsplit, parse_qs
+
+# 搜索接口
+SEARCH_ENDPOINTS = ('pc_search_searchWare',)
+# 商品列表可能出现的键，按命中概率排序
+WARE_KEYS = ('wareList', 'Paragraph', 'wareInfo', 'goodsList', 'searchm', 'data')
+WARE_KEY_RES = [re.compile(r'"%s"\s*:\s*' % k) for k in WARE_KEYS]
+
+
+class PacketCapture:
+    """按接口和类型过滤的抓包解析"""
+
+    def __init__(self, dp, finder, endpoints=SEARCH_ENDPOINTS, mime_types=('json', 'javascript'),
+                 max_packets=20, max_decode_chars=8 * 1024 * 1024):
+        self.dp = dp
+        self.finder = finder
+        self.endpoints = tuple(endpoints)
+        self.mime_types = tuple(mime_types)
+        # 每页最多保留/检查的数据包数，超出部分在本页处理完后丢弃
+        self.max_packets = max_packets
+        # 解码跳过阈值(字符数)：超长响应不解析
+        self.max_decode_chars = max_decode_chars
+        self.last_body = None
+        self._decoder = json.JSONDecoder()
+
+    def start(self):
+        try:
+            self.dp.listen.start(list(self.endpoints), res_type=('XHR', 'Fetch', 'Script'))
+        except TypeError:
+            self.dp.listen.start(list(self.endpoints))
+
+    def clear(self):
+        self.dp.listen.clear()
+        self.last_body = None
+
+    def _match(self, packet):
+        """接口名精确匹配(路径末段或functionId参数) + 响应类型匹配"""
+        try:
+            parts = urlsplit(packet.url)
+            names = {parts.path.rstrip('/').rsplit('/', 1)[-1]}
+            names.update(parse_qs(parts.query).get('functionId', []))
+            if not names.intersection(self.endpoints):
+                return False
+            mime = (packet.response.mimeType or '').lower()
+            return not mime or any(t in mime for t in self.mime_types)
+        except:
+            return False
+
+    def find_wares(self, timeout=2):
+        """逐个检查数据包，命中且解析出商品列表即返回
+
+        最多检查max_packets个；无论是否命中，返回前清空监听队列，
+        丢弃本页多余的数据包(包括等待和人工验证期间堆积的)。
+        """
+        self.last_body = None
+        try:
+            for packet in self.dp.listen.steps(count=self.max_packets, timeout=timeout):
+                if not self._match(packet):
+                    continue
+                body = packet.response.raw_body
+                if not isinstance(body, str) or not body or len(body) > self.max_decode_chars:
+                    continue
+                items = self.parse_wares(body)
+                if items:
+                    self.last_body = body
+                    return items
+        except:
+            pass
+        finally:
+            try:
+                self.dp.listen.clear()
+            except:
+                pass
+        return []
+
+    def parse_wares(self, text):
+        """增量解析：定位商品列表键，只解码该键的值，读完即停"""
+        start = text.find('{')
+        if start < 0:
+            return []
+        for key, key_re in zip(WARE_KEYS, WARE_KEY_RES):
+            for m in key_re.finditer(text, start):
+                try:
+                    value, _ = self._decoder.raw_decode(text, m.end())
+                except ValueError:
+                    continue
+                # 保留键名，查找函数按键名识别列表
+                items = self.finder({key: value})
+                if items:
+                    return items
+        # 兜底：整体解码
+        try:
+            value, _ = self._decoder.raw_decode(text, start)
+            return self.finder(value)
+        except ValueError:
+            return []
+
@@ -0,0 +1,169 @@
+"""
+采集结果整理：外部归并排序 + SKU去重 + 补全结果合并
+	--author:7OZP1K
+"""
+import argparse, csv, heapq, os, tempfile
+from itertools import groupby
+from record import ALIASES
+
+# 补全文件中覆盖到采集记录上的字段(旧列名经ALIASES统一)
+ENRICH_FIELDS = ('评分', '评论数')
+# 同一SKU保留哪条记录: time=采集时间最新, last=文件中最后出现, first=最先出现
+RULES = ('time', 'last', 'first')
+
+SRC_SCRAPE, SRC_FILLER = 0, 1
+
+
+def _sort_key(r):
+    # SKU是纯数字串：先比长度再比字符串，等价于按数值排序且不用转int
+    return (len(r[0]), r[0], r[1], r[2])
+
+
+def _read_header(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return [ALIASES.get(h, h) for h in next(csv.reader(f), [])]
+
+
+def _iter_rows(path, header, src, seq):
+    """按统一表头对齐，产出 [sku, src, seq, *values]"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        own = [ALIASES.get(h, h) for h in next(reader, [])]
+        pos = [own.index(h) if h in own else -1 for h in header]
+        sku_pos = own.index('SKU') if 'SKU' in own else -1
+        for row in reader:
+            if sku_pos < 0 or sku_pos >= len(row):
+                continue
+            sku = row[sku_pos].strip()
+            if not sku:
+                continue
+            seq += 1
+            yield [sku, src, seq] + [row[i] if 0 <= i < len(row) else '' for i in pos]
+
+
+def _write_run(rows, tmp_dir, n):
+    rows.sort(key=_sort_key)
+    path = os.path.join(tmp_dir, f'run_{n:05d}.csv')
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(rows)
+    return path
+
+
+def _read_run(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            row[1] = int(row[1])
+            row[2] = int(row[2])
+            yield row
+
+
+def _merge(paths):
+    return heapq.merge(*[_read_run(p) for p in paths], key=_sort_key)
+
+
+def _reduce_runs(paths, tmp_dir, fan_in):
+    """顺串过多时分批归并，避免同时打开太多文件"""
+    n = 0
+    while len(paths) > fan_in:
+        merged = []
+        for i in range(0, len(paths), fan_in):
+            batch = paths[i:i + fan_in]
+            out = os.path.join(tmp_dir, f'merge_{n:05d}.csv')
+            n += 1
+            with open(out, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f).writerows(_merge(batch))
+            for p in batch:
+                os.remove(p)
+            merged.append(out)
+        paths = merged
+    return paths
+
+
+def _pick(rows, rule, time_idx):
+    if not rows:
+        return None
+    if rule == 'first':
+        return rows[0]
+    if rule == 'time' and time_idx >= 0:
+        return max(rows, key=lambda r: (r[time_idx], r[2]))
+    return rows[-1]
+
+
+def compact(scrape_files, output_file, filler_file=None, rule='time',
+            chunk_rows=200000, fan_in=64, tmp_dir=None):
+    """把一个或多个采集文件(可附带补全文件)整理成按SKU数值升序、去重的单一文件"""
+    if rule not in RULES:
+        raise ValueError(f"rule 必须是 {RULES} 之一")
+    if isinstance(scrape_files, str):
+        scrape_files = [scrape_files]
+    scrape_files = [p for p in scrape_files if os.path.exists(p)]
+    if filler_file and not os.path.exists(filler_file):
+        filler_file = None
+    if not scrape_files and not filler_file:
+        print("文件不存在")
+        return 0
+
+    header = []
+    for path in scrape_files + ([filler_file] if filler_file else []):
+        for h in _read_header(path):
+            if h not in header:
+                header.append(h)
+    if 'SKU' not in header:
+        print("缺少SKU列")
+        return 0
+
+    sources = [(p, SRC_SCRAPE) for p in scrape_files]
+    if filler_file:
+        sources.append((filler_file, SRC_FILLER))
+
+    sku_idx = 3 + header.index('SKU')
+    time_idx = 3 + header.index('采集时间') if '采集时间' in header else -1
+    enrich_idx = [3 + header.index(h) for h in ENRICH_FIELDS if h in header]
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        # 1. 分块排序写出顺串
+        runs, chunk, seq = [], [], 0
+        for path, src in sources:
+            for row in _iter_rows(path, header, src, seq):
+                seq = row[2]
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    runs.append(_write_run(chunk, tmp, len(runs)))
+                    chunk = []
+        if chunk:
+            runs.append(_write_run(chunk, tmp, len(runs)))
+        chunk = None
+        runs = _reduce_runs(runs, tmp, fan_in)
+
+        # 2. 多路归并，同SKU分组，挑选记录并合并补全字段
+        count = 0
+        with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for sku, group in groupby(_merge(runs), key=lambda r: r[0]):
+                scraped, filled = [], []
+                for row in group:
+                    (filled if row[1] == SRC_FILLER else scraped).append(row)
+                best = _pick(scraped, rule, time_idx) or _pick(filled, rule, time_idx)
+                extra = _pick(filled, rule, time_idx)
+                if extra is not None and extra is not best:
+                    for i in enrich_idx:
+                        if extra[i].strip() and extra[i].strip() != '0':
+                            best[i] = extra[i]
+                best[sku_idx] = f"\t{sku}"
+                writer.writerow(best[3:])
+                count += 1
+
+    print(f"整理完成: {count}个SKU -> {output_file}")
+    return count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='按SKU数值升序去重并合并补全结果')
+    parser.add_argument('output')
+    parser.add_argument('scrape', nargs='+')
+    parser.add_argument('--filler')
+    parser.add_argument('--rule', choices=RULES, default='time')
+    parser.add_argument('--chunk', type=int, default=200000)
+    args = parser.parse_args()
+    compact(args.scrape, args.output, filler_file=args.filler, rule=args.rule, chunk_rows=args.chunk)
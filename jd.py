@@ -3,17 +3,35 @@
 	--author:7OZP1K
 """
 from DrissionPage import ChromiumPage, ChromiumOptions
-import csv, time, os, re, random, json, requests
+import csv, glob, time, os, re, random, json, requests
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
+from archive import CaptureArchive, reparse
+from capture import PacketCapture
+from compact import compact
+from record import Product, RecordWriter, read_records
+from workqueue import KeywordQueue, LeaseHeartbeat, default_worker_id
 
 csv_lock = Lock()
 
 class JDProductScraper:
     """商品信息采集"""
     
-    def __init__(self):
+    def __init__(self, browser=True, archive=None):
+        # archive: 原始数据存档文件名(相对路径放桌面)，为空则不存档
+        self.archive = None
+        if archive:
+            if not os.path.isabs(archive):
+                archive = os.path.join(self._get_desktop_path(), archive)
+            self.archive = CaptureArchive(archive, 'jd')
+        
+        # browser=False 时只用解析功能(离线重解析)
+        if not browser:
+            self.dp = None
+            self.capture = PacketCapture(None, self._find_list_in_json)
+            return
+        
         co = ChromiumOptions()
         co.set_argument('--mute-audio')
         co.set_argument('--no-first-run')
@@ -28,6 +46,7 @@ class JDProductScraper:
                 pass
         
         self.dp = ChromiumPage(addr_or_opts=co)
+        self.capture = PacketCapture(self.dp, self._find_list_in_json)
         print("=" * 60)
         print("浏览器采集器已启动")
         print("=" * 60)
@@ -35,11 +54,7 @@ class JDProductScraper:
     def _get_desktop_path(self):
         return os.path.join(os.path.expanduser("~"), 'Desktop')
 
-    def run(self, filename='关键词.txt', pages=10, output='汽车零配件数据.csv'):
-        desktop_path = self._get_desktop_path()
-        keywords_file = os.path.join(desktop_path, filename)
-        output_file = os.path.join(desktop_path, output)
-
+    def _load_keywords(self, keywords_file, filename):
         if not os.path.exists(keywords_file):
             try:
                 with open(keywords_file, 'w', encoding='utf-8') as f:
@@ -50,12 +65,21 @@ class JDProductScraper:
 
         if not os.path.exists(keywords_file):
             print(f"找不到关键词文件")
-            return
+            return None
 
         with open(keywords_file, 'r', encoding='utf-8') as f:
-            keywords = [k.strip() for k in re.split(r'[,，\n]', f.read()) if k.strip()]
+            return [k.strip() for k in re.split(r'[,，\n]', f.read()) if k.strip()]
+
+    def run(self, filename='关键词.txt', pages=10, output='汽车零配件数据.csv'):
+        desktop_path = self._get_desktop_path()
+        keywords_file = os.path.join(desktop_path, filename)
+        output_file = os.path.join(desktop_path, output)
+
+        keywords = self._load_keywords(keywords_file, filename)
+        if keywords is None:
+            return
         
-        self.dp.listen.start(['pc_search_searchWare', 'api.m.jd.com', 'search'])
+        self.capture.start()
         
         total_count = 0
         
@@ -64,57 +88,7 @@ class JDProductScraper:
             print(f"[{idx}/{len(keywords)}] 正在采集: {kw}")
             print(f"{'=' * 60}")
             
-            self.dp.listen.clear() 
-            url = f'https://search.jd.com/Search?keyword={kw}&enc=utf-8&psort=3'
-            self.dp.get(url)
-            
-            if not self.dp.ele('@data-sku', timeout=6):
-                print("等待超时，尝试手动验证...")
-                self._handle_captcha()
-
-            kw_products = []
-            
-            for page in range(1, pages + 1):
-                print(f"   第{page}页", end=" ", flush=True)
-                self._human_scroll()
-                
-                # 获取数据：优先API，其次DOM，最后正则
-                raw_items = self._try_api_targeted()
-                source = "API"
-                
-                if not raw_items:
-                    raw_items = self.dp.eles('@data-sku')
-                    raw_items = [item for item in raw_items if item.rect.size[1] > 0] 
-                    source = "DOM"
-                
-                if not raw_items:
-                    raw_items = self._try_regex_chunks()
-                    source = "源码"
-
-                if len(raw_items) == 0:
-                    print(f" -> {source}(0) 暂停! 请在浏览器手动操作...")
-                    input("解决后按回车...")
-                    raw_items = self.dp.eles('@data-sku')
-                    
-                print(f"-> {source}({len(raw_items)})", end="")
-
-                valid_items = []
-                for i, item in enumerate(raw_items, 1):
-                    p = self._parse_item_universal(item, kw, page, i)
-                    if p and p['SKU'].strip(): 
-                        valid_items.append(p)
-
-                print(f" -> {len(valid_items)}条", end="")
-                kw_products.extend(valid_items)
-
-                if page < pages:
-                    self.dp.listen.clear() 
-                    if not self._next_page():
-                        print(f" [无下页]", end="")
-                        break
-                    time.sleep(random.uniform(2, 4))
-                else:
-                    print("")
+            kw_products = self._scrape_keyword(kw, pages)
 
             if kw_products:
                 self._save(kw_products, output_file)
@@ -127,22 +101,138 @@ class JDProductScraper:
         print(f"\n采集结束！总计: {total_count}条")
         self.dp.quit()
 
+    def run_queue(self, db='关键词队列.db', filename='关键词.txt', pages=10,
+                  output='汽车零配件数据.csv', worker=None, lease=300, max_attempts=3,
+                  archive=None):
+        """队列模式：多个进程/主机共享同一个队列库，按租约领取关键词"""
+        desktop_path = self._get_desktop_path()
+        queue = KeywordQueue(db if os.path.isabs(db) else os.path.join(desktop_path, db),
+                             lease=lease, max_attempts=max_attempts)
+        worker = worker or default_worker_id()
+        # 每个节点写自己的文件，避免多进程同时追加同一个CSV
+        output_file = os.path.join(desktop_path, output.replace('.csv', f'_{worker}.csv'))
+        # 存档同理按节点分文件，离线重解析时一起传入
+        if archive:
+            base, ext = os.path.splitext(archive)
+            archive = f"{base}_{worker}{ext}"
+            if not os.path.isabs(archive):
+                archive = os.path.join(desktop_path, archive)
+            self.archive = CaptureArchive(archive, 'jd')
+
+        keywords_file = os.path.join(desktop_path, filename)
+        if os.path.exists(keywords_file):
+            added = queue.add(self._load_keywords(keywords_file, filename) or [])
+            if added:
+                print(f"导入关键词: {added}个")
+        print(f"节点: {worker} | 队列状态: {queue.stats()}")
+
+        self.capture.start()
+        
+        total_count = 0
+        
+        while True:
+            kw = queue.claim(worker)
+            if kw is None:
+                break
+            print(f"\n{'=' * 60}")
+            print(f"[{worker}] 正在采集: {kw}")
+            print(f"{'=' * 60}")
+
+            heartbeat = LeaseHeartbeat(queue, kw, worker)
+            heartbeat.start()
+            try:
+                kw_products = self._scrape_keyword(kw, pages)
+            except KeyboardInterrupt:
+                heartbeat.stop()
+                queue.release(kw, worker, refund=True)
+                raise
+            except:
+                heartbeat.stop()
+                queue.release(kw, worker)
+                raise
+            heartbeat.stop()
+
+            # 写入前再续约一次：续约成功说明租约仍在本节点，且至少再保留lease秒
+            if heartbeat.lost or not queue.heartbeat(kw, worker):
+                print(" [租约已被回收，丢弃结果]")
+                continue
+
+            if kw_products:
+                self._save(kw_products, output_file)
+                total_count += len(kw_products)
+            if not queue.complete(kw, worker):
+                print(f" [警告: {kw} 完成标记失败，租约已丢失，结果可能与其他节点重复]")
+            time.sleep(3)
+        
+        print(f"\n采集结束！总计: {total_count}条 | 队列状态: {queue.stats()}")
+        self.dp.quit()
+
+    def _scrape_keyword(self, kw, pages):
+        self.capture.clear()
+        url = f'https://search.jd.com/Search?keyword={kw}&enc=utf-8&psort=3'
+        self.dp.get(url)
+        
+        if not self.dp.ele('@data-sku', timeout=6):
+            print("等待超时，尝试手动验证...")
+            self._handle_captcha()
+
+        kw_products = []
+        
+        for page in range(1, pages + 1):
+            print(f"   第{page}页", end=" ", flush=True)
+            self._human_scroll()
+            ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            # 获取数据：优先API，其次DOM，最后正则
+            raw_items = self._try_api_targeted()
+            source = "API"
+            
+            if not raw_items:
+                raw_items = self.dp.eles('@data-sku')
+                raw_items = [item for item in raw_items if item.rect.size[1] > 0] 
+                source = "DOM"
+            
+            if not raw_items:
+                raw_items = self._try_regex_chunks()
+                source = "源码"
+
+            if len(raw_items) == 0:
+                print(f" -> {source}(0) 暂停! 请在浏览器手动操作...")
+                input("解决后按回车...")
+                raw_items = self.dp.eles('@data-sku')
+                source = "DOM"
+                
+            print(f"-> {source}({len(raw_items)})", end="")
+            if self.archive:
+                self.archive.append_page(kw, page, source, ts, self.capture.last_body, lambda: self.dp.html)
+
+            valid_items = []
+            for i, item in enumerate(raw_items, 1):
+                p = self._parse_item_universal(item, kw, page, i, ts)
+                if p: 
+                    valid_items.append(p)
+
+            print(f" -> {len(valid_items)}条", end="")
+            kw_products.extend(valid_items)
+
+            if page < pages:
+                self.capture.clear()
+                if not self._next_page():
+                    print(f" [无下页]", end="")
+                    break
+                time.sleep(random.uniform(2, 4))
+            else:
+                print("")
+
+        return kw_products
+
     def _human_scroll(self):
         self.dp.scroll.to_bottom()
         time.sleep(1)
         self.dp.scroll.up(300)
 
     def _try_api_targeted(self):
-        try:
-            packets = self.dp.listen.steps(timeout=2)
-            for packet in packets:
-                if 'pc_search_searchWare' in packet.url or 'api.m.jd.com' in packet.url:
-                    items = self._find_list_in_json(packet.response.body)
-                    if items: 
-                        return items
-        except: 
-            pass
-        return []
+        return self.capture.find_wares(timeout=2)
 
     def _find_list_in_json(self, data):
         if isinstance(data, dict):
@@ -167,86 +257,78 @@ class JDProductScraper:
                     return res
         return []
 
-    def _parse_item_universal(self, item, kw, page, idx):
+    def _parse_item_universal(self, item, kw, page, idx, ts):
         try:
-            res = {
-                '采集时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                '关键词': kw, 
-                '页码': page,
-                'SKU': '', 
-                '标题': '', 
-                '价格': '', 
-                '店铺': '', 
-                '销量': '', 
-                '评分': '', 
-                '链接': ''
-            }
+            sku = title = price = shop = comments = ''
             
             # API数据
             if isinstance(item, dict) and not item.get('is_chunk'):
-                res['SKU'] = str(item.get('skuId') or item.get('sku') or '')
-                res['标题'] = (item.get('wname') or item.get('wareName') or item.get('title') or '')
-                res['价格'] = str(item.get('jdPrice') or item.get('price') or '')
-                res['店铺'] = item.get('goodShop', {}).get('goodShopName') or item.get('shop_name') or ''
-                res['销量'] = str(item.get('commentCount') or '0')
+                sku = str(item.get('skuId') or item.get('sku') or '')
+                title = (item.get('wname') or item.get('wareName') or item.get('title') or '')
+                price = str(item.get('jdPrice') or item.get('price') or '')
+                shop = item.get('goodShop', {}).get('goodShopName') or item.get('shop_name') or ''
+                comments = str(item.get('commentCount') or '0')
 
             # DOM数据
             elif hasattr(item, 'ele'):
-                res['SKU'] = item.attr('data-sku') or ''
+                sku = item.attr('data-sku') or ''
                 t_ele = item.ele('.p-name a', timeout=0.1)
-                res['标题'] = t_ele.attr('title') or t_ele.text.strip() if t_ele else ''
-                if not res['标题']: 
-                    res['标题'] = item.ele('.p-name em').text.strip() if item.ele('.p-name em') else ''
+                title = t_ele.attr('title') or t_ele.text.strip() if t_ele else ''
+                if not title: 
+                    title = item.ele('.p-name em').text.strip() if item.ele('.p-name em') else ''
                 
                 p_box = item.ele('.p-price', timeout=0.1)
                 if p_box:
                     match = re.search(r'(\d+(\.\d+)?)', p_box.text)
                     if match: 
-                        res['价格'] = match.group(1)
+                        price = match.group(1)
                 
                 c_box = item.ele('.p-commit', timeout=0.1)
                 if c_box:
                     match = re.search(r'(\d+[万\+]*)', c_box.text)
                     if match: 
-                        res['销量'] = match.group(1)
+                        comments = match.group(1)
                 
                 s_ele = item.ele('.p-shop', timeout=0.1)
-                res['店铺'] = s_ele.text.strip() if s_ele else '京东'
+                shop = s_ele.text.strip() if s_ele else '京东'
 
             # 源码数据
             elif isinstance(item, dict) and item.get('is_chunk'):
                 chunk = item['chunk_html']
                 sku_m = re.search(r'data-sku="(\d+)"', chunk)
-                res['SKU'] = sku_m.group(1) if sku_m else ''
+                sku = sku_m.group(1) if sku_m else ''
                 t_m = re.search(r'title="([^"]+)"', chunk)
-                res['标题'] = t_m.group(1) if t_m else ''
+                title = t_m.group(1) if t_m else ''
                 p_m = re.search(r'class="p-price".*?(\d+\.\d+)', chunk)
-                res['价格'] = p_m.group(1) if p_m else ''
+                price = p_m.group(1) if p_m else ''
                 c_m = re.search(r'(\d+[万\+]*)条评价', chunk)
-                res['销量'] = c_m.group(1) if c_m else '0'
+                comments = c_m.group(1) if c_m else '0'
 
-            if res['SKU']: 
-                res['SKU'] = f"\t{res['SKU']}" 
-            if res['价格']: 
-                res['价格'] = re.sub(r'[^\d\.]', '', str(res['价格']))
-            res['链接'] = f"https://item.jd.com/{res['SKU'].strip()}.html"
+            sku = sku.strip()
+            if not sku:
+                return None
+            if price: 
+                price = re.sub(r'[^\d\.]', '', str(price))
             
-            return res if res['SKU'].strip() else None
+            return Product(ts, kw, page, f"\t{sku}", title, price, shop, comments, '',
+                           f"https://item.jd.com/{sku}.html")
         except: 
             return None
 
     def _try_regex_chunks(self):
         try:
-            html = self.dp.html
-            chunks = []
-            for match in re.finditer(r'data-sku="(\d+)"', html):
-                start = match.start()
-                chunk = html[max(0, start-200): min(len(html), start+1500)]
-                chunks.append({'chunk_html': chunk, 'is_chunk': True})
-            return chunks
+            return self._split_chunks(self.dp.html)
         except: 
             return []
 
+    def _split_chunks(self, html):
+        chunks = []
+        for match in re.finditer(r'data-sku="(\d+)"', html):
+            start = match.start()
+            chunk = html[max(0, start-200): min(len(html), start+1500)]
+            chunks.append({'chunk_html': chunk, 'is_chunk': True})
+        return chunks
+
     def _next_page(self):
         try:
             btn = self.dp.ele('.pn-next', timeout=1) or self.dp.ele('text:下一页', timeout=1)
@@ -266,13 +348,9 @@ class JDProductScraper:
 
     def _save(self, products, filename):
         try:
-            exist = os.path.exists(filename)
-            with open(filename, 'a', encoding='utf-8-sig', newline='') as f:
-                headers = list(products[0].keys())
-                w = csv.DictWriter(f, fieldnames=headers)
-                if not exist: 
-                    w.writeheader()
-                w.writerows(products)
+            RecordWriter(filename).write(products)
+        except ValueError as e:
+            print(f"\n保存失败: {e}")
         except: 
             pass
 
@@ -287,104 +365,134 @@ class JDProductScraper:
             pass
 
 
-class MultiThreadFiller:
-    """多线程数据补全"""
+class SummaryFiller:
+    """评分/评论数补全的公共部分：断点续跑、结果合并与写出，不含网络请求"""
     
-    def __init__(self, workers=32):
+    SUMMARY_URL = "https://club.jd.com/comment/productCommentSummaries.action"
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Referer': 'https://item.jd.com/'
+    }
+    
+    def __init__(self, workers):
         self.workers = workers
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Referer': 'https://item.jd.com/'
-        })
-
-    def process_item(self, row):
-        sku = row.get('SKU', '').strip().replace('\t', '')
-        if not sku: 
-            return None
 
-        has_score = row.get('评分') and row['评分'].strip()
-        has_sales = row.get('销量') and row['销量'].strip() and row['销量'] != '0'
-        
+    def _missing(self, row):
+        """返回 (sku, 已有评分, 已有评论数)，无需补全时sku为空"""
+        sku = row.SKU.strip()
+        has_score = row.评分.strip()
+        has_sales = row.评论数.strip() and row.评论数 != '0'
         if has_score and has_sales:
-            return None
+            return '', has_score, has_sales
+        return sku, has_score, has_sales
 
-        try:
-            url = f"https://club.jd.com/comment/productCommentSummaries.action"
-            params = {'referenceIds': sku}
-            resp = self.session.get(url, params=params, timeout=5)
-            data = resp.json()
+    def _apply_summary(self, row, data, has_score, has_sales):
+        if 'CommentsCount' in data and data['CommentsCount']:
+            item_data = data['CommentsCount'][0]
             
-            if 'CommentsCount' in data and data['CommentsCount']:
-                item_data = data['CommentsCount'][0]
-                
-                if not has_score:
-                    rate = item_data.get('GoodRateShow', 0)
-                    score = round(float(rate) * 5 / 100, 1)
-                    row['评分'] = str(score)
-                
-                if not has_sales:
-                    c_str = item_data.get('CommentCountStr', '')
-                    c_num = item_data.get('CommentCount', 0)
-                    if c_str and c_str != '0':
-                        row['销量'] = c_str.replace('+', '')
-                    elif c_num:
-                        row['销量'] = str(c_num)
-                        
-            return row
-        except:
-            return None
+            if not has_score:
+                rate = item_data.get('GoodRateShow', 0)
+                score = round(float(rate) * 5 / 100, 1)
+                row = row._replace(评分=str(score))
+            
+            if not has_sales:
+                c_str = item_data.get('CommentCountStr', '')
+                c_num = item_data.get('CommentCount', 0)
+                if c_str and c_str != '0':
+                    row = row._replace(评论数=c_str.replace('+', ''))
+                elif c_num:
+                    row = row._replace(评论数=str(c_num))
+                    
+        return row
 
-    def run(self, csv_file, output_file):
-        print(f"\n启动多线程补全 ({self.workers}线程)...")
+    def _prepare(self, csv_file, output_file):
+        """读取输入，跳过输出文件中已完成的SKU，返回 (输出RecordWriter, 待处理记录)"""
         desktop = os.path.join(os.path.expanduser("~"), 'Desktop')
         input_path = os.path.join(desktop, csv_file)
         output_path = os.path.join(desktop, output_file)
 
         if not os.path.exists(input_path):
             print("文件不存在")
-            return
+            return None
 
-        all_data = []
-        with open(input_path, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
-            if '评分' not in fieldnames: 
-                fieldnames = list(fieldnames) + ['评分']
-            if '销量' not in fieldnames: 
-                fieldnames = list(fieldnames) + ['销量']
-            all_data = list(reader)
+        all_data = list(read_records(input_path))
 
         print(f"总数据: {len(all_data)}条，正在分配任务...")
 
         processed_skus = set()
         if os.path.exists(output_path):
-            with open(output_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    processed_skus.add(row.get('SKU', '').strip())
+            for row in read_records(output_path):
+                processed_skus.add(row.SKU.strip())
             print(f"历史已完成: {len(processed_skus)}条(跳过)")
         else:
-            with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
+            RecordWriter(output_path).write([])
+
+        try:
+            writer = RecordWriter(output_path)
+        except ValueError as e:
+            print(e)
+            return None
 
         tasks = []
         for row in all_data:
-            sku = row.get('SKU', '').strip()
+            sku = row.SKU.strip()
             if sku not in processed_skus:
                 tasks.append(row)
 
         if not tasks:
             print("所有数据已完成")
+            return None
+
+        return writer, tasks
+
+    def _write_row(self, writer, record_writer, row):
+        """写出一条补全结果，SKU补\t前缀并按输出文件表头排列"""
+        if not row.SKU.startswith('\t'):
+            row = row._replace(SKU=f"\t{row.SKU}")
+        try:
+            writer.writerow(record_writer.arrange(row))
+        except csv.Error:
+            pass
+
+
+class MultiThreadFiller(SummaryFiller):
+    """多线程数据补全"""
+    
+    def __init__(self, workers=32):
+        super().__init__(workers)
+        self.session = requests.Session()
+        self.session.headers.update(self.HEADERS)
+        # 连接池与线程数一致，避免超出默认10个连接后反复新建TLS连接
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount('https://', adapter)
+
+    def process_item(self, row):
+        sku, has_score, has_sales = self._missing(row)
+        if not sku: 
+            return None
+
+        try:
+            params = {'referenceIds': sku}
+            resp = self.session.get(self.SUMMARY_URL, params=params, timeout=5)
+            return self._apply_summary(row, resp.json(), has_score, has_sales)
+        except:
+            return None
+
+    def run(self, csv_file, output_file):
+        print(f"\n启动多线程补全 ({self.workers}线程)...")
+        prepared = self._prepare(csv_file, output_file)
+        if not prepared:
             return
+        record_writer, tasks = prepared
 
         print(f"开始并发处理 {len(tasks)}条任务...")
         
         count = 0
         success = 0
         
-        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+        with ThreadPoolExecutor(max_workers=self.workers) as executor, \
+                open(record_writer.filename, 'a', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
             futures = {executor.submit(self.process_item, row): row for row in tasks}
             
             for future in as_completed(futures):
@@ -394,19 +502,13 @@ class MultiThreadFiller:
                 row_to_save = result_row if result_row else original_row
                 
                 with csv_lock:
-                    try:
-                        with open(output_path, 'a', encoding='utf-8-sig', newline='') as f:
-                            writer = csv.DictWriter(f, fieldnames=fieldnames)
-                            if not row_to_save['SKU'].startswith('\t'):
-                                row_to_save['SKU'] = f"\t{row_to_save['SKU']}"
-                            writer.writerow(row_to_save)
-                    except: 
-                        pass
+                    self._write_row(writer, record_writer, row_to_save)
                 
                 if result_row: 
                     success += 1
                 
                 if count % 50 == 0:
+                    f.flush()
                     print(f"\r进度: {count}/{len(tasks)} | 成功补全: {success}", end="")
 
         print(f"\n\n全部完成！成功补全: {success}条")
@@ -416,10 +518,54 @@ class MultiThreadFiller:
 if __name__ == '__main__':
     print("1. 采集数据(单线程)")
     print("2. 极速补全数据(多线程)")
+    print("3. 队列采集(多节点)")
+    print("4. 整理数据(排序去重)")
+    print("5. 异步补全数据(协程)")
+    print("6. 离线重解析(原始数据存档)")
     choice = input("请选择: ").strip()
     
     if choice == '1':
-        JDProductScraper().run()
+        keep = input("保存原始数据存档以便离线重解析? (y/N): ").strip().lower() == 'y'
+        JDProductScraper(archive='采集存档.bin' if keep else None).run()
+    elif choice == '3':
+        db = input("队列库路径[默认: 桌面/关键词队列.db]: ").strip() or '关键词队列.db'
+        keep = input("保存原始数据存档以便离线重解析? (y/N): ").strip().lower() == 'y'
+        JDProductScraper().run_queue(db=db, archive='采集存档.bin' if keep else None)
+    elif choice == '4':
+        desktop = os.path.join(os.path.expanduser("~"), 'Desktop')
+        csv_file = input("输入文件名[默认: 汽车零配件数据.csv]: ").strip() or '汽车零配件数据.csv'
+        rule = input("保留规则 time/last/first [默认: time]: ").strip() or 'time'
+        # 队列模式各节点写 汽车零配件数据_{节点}.csv，一起整理
+        base, ext = os.path.splitext(csv_file)
+        scrape_files = sorted(
+            p for p in glob.glob(os.path.join(desktop, glob.escape(base) + '*' + ext))
+            if not os.path.splitext(p)[0].endswith(('_完整版', '_整理版', '_重解析')))
+        print(f"待整理文件: {[os.path.basename(p) for p in scrape_files]}")
+        compact(
+            scrape_files=scrape_files,
+            filler_file=os.path.join(desktop, csv_file.replace('.csv', '_完整版.csv')),
+            output_file=os.path.join(desktop, csv_file.replace('.csv', '_整理版.csv')),
+            rule=rule
+        )
+    elif choice == '5':
+        from async_filler import AsyncFiller
+        csv_file = input("输入文件名[默认: 汽车零配件数据.csv]: ").strip() or '汽车零配件数据.csv'
+        concurrency = input("并发数[默认: 200]: ").strip()
+        concurrency = int(concurrency) if concurrency.isdigit() else 200
+        http2 = input("启用HTTP/2? 需安装 httpx[http2] (y/N): ").strip().lower() == 'y'
+        if concurrency < 1:
+            print("并发数至少为1")
+        else:
+            AsyncFiller(concurrency=concurrency, http2=http2).run(
+                csv_file=csv_file, 
+                output_file=csv_file.replace('.csv', '_完整版.csv')
+            )
+    elif choice == '6':
+        desktop = os.path.join(os.path.expanduser("~"), 'Desktop')
+        archive_files = input("存档文件名(多个用逗号分隔)[默认: 采集存档.bin]: ").strip() or '采集存档.bin'
+        csv_file = input("输出文件名[默认: 汽车零配件数据_重解析.csv]: ").strip() or '汽车零配件数据_重解析.csv'
+        reparse([os.path.join(desktop, a.strip()) for a in re.split(r'[,，]', archive_files) if a.strip()],
+                os.path.join(desktop, csv_file))
     else:
         csv_file = input("输入文件名[默认: 汽车零配件数据.csv]: ").strip() or '汽车零配件数据.csv'
         MultiThreadFiller(workers=32).run(
@@ -5,18 +5,32 @@
 """
 
 from DrissionPage import ChromiumPage, ChromiumOptions
-import csv, time, os, re, random, ctypes
+import time, os, re, random, ctypes
 from ctypes import wintypes
 from datetime import datetime
-import json
+from capture import PacketCapture
+from record import Product, RecordWriter
+from archive import CaptureArchive
 
 class AutoPartsScraper:
-    def __init__(self):
+    def __init__(self, browser=True, archive=None):
+        self.archive = None
+        if archive:
+            if not os.path.isabs(archive):
+                archive = os.path.join(self._get_true_desktop_path(), archive)
+            self.archive = CaptureArchive(archive, 'jd2')
+
+        if not browser:
+            self.dp = None
+            self.capture = PacketCapture(None, self._find_list_in_json)
+            return
+
         co = ChromiumOptions()
         co.set_argument('--mute-audio')
         co.set_argument('--no-first-run')
         
         self.dp = ChromiumPage(addr_or_opts=co)
+        self.capture = PacketCapture(self.dp, self._find_list_in_json)
         print("="*60)
         print("浏览器已启动 (评分+评论数增强版)")
         print("="*60)
@@ -49,7 +63,7 @@ class AutoPartsScraper:
 
         print(f"采集任务: {len(keywords)}个词 | 目标: {pages}页/词")
         
-        self.dp.listen.start(['pc_search_searchWare', 'search', 'wareList'])
+        self.capture.start()
         
         total_count = 0
         
@@ -58,7 +72,7 @@ class AutoPartsScraper:
             print(f"正在采集: {kw}")
             print(f"{'='*60}")
             
-            self.dp.listen.clear() 
+            self.capture.clear()
             url = f'https://search.jd.com/Search?keyword={kw}&enc=utf-8&psort=3'
             self.dp.get(url)
             
@@ -74,6 +88,7 @@ class AutoPartsScraper:
             for page in range(1, pages + 1):
                 print(f"\n   第 {page} 页", end="")
                 self._human_scroll()
+                ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 
                 raw_items = self._try_api()
                 source = "API"
@@ -95,17 +110,19 @@ class AutoPartsScraper:
                     source = "重试DOM" if raw_items else "重试失败"
 
                 print(f" -> {source}捕获({len(raw_items)}个)", end="")
+                if self.archive:
+                    self.archive.append_page(kw, page, source, ts, self.capture.last_body, lambda: self.dp.html)
 
                 valid_items = []
                 for i, item in enumerate(raw_items, 1):
-                    p = self._parse_item_nuclear(item, kw, page, i)
+                    p = self._parse_item_nuclear(item, kw, page, i, ts)
                     if p: valid_items.append(p)
 
                 print(f" -> 入库: {len(valid_items)}条", end="")
                 kw_products.extend(valid_items)
 
                 if page < pages:
-                    self.dp.listen.clear() 
+                    self.capture.clear()
                     if not self._next_page():
                         print(f" [停止]", end="")
                         break
@@ -178,117 +195,120 @@ class AutoPartsScraper:
         
         return ''
 
-    def _parse_item_nuclear(self, item, kw, page, idx):
+    def _parse_item_nuclear(self, item, kw, page, idx, ts):
         """商品数据解析器 - 增加评分和评论数"""
         try:
-            res = {
-                '采集时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                '关键词': kw, '页码': page,
-                'SKU': '', '标题': '', '价格': '', 
-                '店铺': '', '评分': '', '评论数': '', '链接': ''
-            }
+            sku = title = price = shop = rating = comments = ''
             
             if isinstance(item, dict) and not item.get('is_chunk'):
-                res['SKU'] = str(item.get('skuId') or item.get('sku') or '')
-                res['标题'] = (item.get('wname') or item.get('wareName') or 
-                             item.get('title') or item.get('name') or '')
-                res['价格'] = str(item.get('jdPrice') or item.get('price') or '')
-                res['店铺'] = item.get('goodShop', {}).get('goodShopName') or item.get('shopName') or '京东'
+                sku = str(item.get('skuId') or item.get('sku') or '')
+                title = (item.get('wname') or item.get('wareName') or 
+                         item.get('title') or item.get('name') or '')
+                price = str(item.get('jdPrice') or item.get('price') or '')
+                shop = item.get('goodShop', {}).get('goodShopName') or item.get('shopName') or '京东'
                 
                 comment_count = item.get('commentCount') or item.get('comments') or 0
-                res['评论数'] = str(comment_count)
+                comments = str(comment_count)
                 
                 score = item.get('score') or item.get('rating') or item.get('goodRate') or ''
-                res['评分'] = str(score) if score else ''
+                rating = str(score) if score else ''
 
             elif hasattr(item, 'ele'):
-                res['SKU'] = item.attr('data-sku') or ''
+                sku = item.attr('data-sku') or ''
                 
                 img_ele = item.ele('tag:img', timeout=0.1)
                 if img_ele: 
-                    res['标题'] = img_ele.attr('alt') or ''
+                    title = img_ele.attr('alt') or ''
                 
-                if not res['标题']:
+                if not title:
                     t_ele = item.ele('.p-name em', timeout=0.1)
                     if t_ele: 
-                        res['标题'] = t_ele.text.strip()
+                        title = t_ele.text.strip()
 
-                if not res['标题'] or len(res['标题']) < 3:
+                if not title or len(title) < 3:
                     lines = item.text.split('\n')
                     valid_lines = [l for l in lines if len(l) > 8 and '¥' not in l]
                     if valid_lines:
-                        res['标题'] = max(valid_lines, key=len).strip()
+                        title = max(valid_lines, key=len).strip()
 
                 full_text = item.text
                 p_match = re.search(r'[¥￥]\s*(\d+(\.\d+)?)', full_text)
                 if p_match:
-                    res['价格'] = p_match.group(1)
+                    price = p_match.group(1)
                 
                 comment_ele = item.ele('.p-commit', timeout=0.1)
                 if comment_ele:
-                    res['评论数'] = self._extract_comment_count(comment_ele.text)
+                    comments = self._extract_comment_count(comment_ele.text)
                 
-                if not res['评论数'] or res['评论数'] == '0':
-                    res['评论数'] = self._extract_comment_count(full_text)
+                if not comments or comments == '0':
+                    comments = self._extract_comment_count(full_text)
                 
-                if not res['评论数'] or res['评论数'] == '0':
+                if not comments or comments == '0':
                     comment_attr = item.attr('data-comment')
                     if comment_attr:
-                        res['评论数'] = comment_attr
+                        comments = comment_attr
 
                 rating_ele = item.ele('.p-score', timeout=0.1)
                 if rating_ele:
-                    res['评分'] = self._extract_rating(rating_ele.text)
+                    rating = self._extract_rating(rating_ele.text)
                 
-                if not res['评分'] and comment_ele:
-                    res['评分'] = self._extract_rating(comment_ele.text)
+                if not rating and comment_ele:
+                    rating = self._extract_rating(comment_ele.text)
                 
-                if not res['评分']:
-                    res['评分'] = self._extract_rating(full_text)
+                if not rating:
+                    rating = self._extract_rating(full_text)
                 
-                if not res['评分']:
+                if not rating:
                     score_attr = item.attr('data-score')
                     if score_attr:
-                        res['评分'] = score_attr
+                        rating = score_attr
 
                 shop_ele = item.ele('.p-shop a', timeout=0.1)
                 if shop_ele:
-                    res['店铺'] = shop_ele.text.strip()
+                    shop = shop_ele.text.strip()
                 
-                if not res['店铺'] or res['店铺'] == '京东':
+                if not shop or shop == '京东':
                     shop_div = item.ele('.p-shop', timeout=0.1)
                     if shop_div:
                         shop_text = shop_div.text.strip()
                         shop_text = re.sub(r'(进店|关注|自营)', '', shop_text).strip()
                         if shop_text:
-                            res['店铺'] = shop_text
+                            shop = shop_text
                 
-                if not res['店铺'] or res['店铺'] == '京东':
+                if not shop or shop == '京东':
                     shop_match = re.search(r'([^\s]+?(?:旗舰店|专营店|官方店|自营|京东))', full_text)
                     if shop_match:
-                        res['店铺'] = shop_match.group(1)
+                        shop = shop_match.group(1)
                     else:
-                        res['店铺'] = '京东'
-
-            if res['SKU']: 
-                res['SKU'] = f"\t{res['SKU']}" 
-            if res['价格']: 
-                res['价格'] = re.sub(r'[^\d\.]', '', str(res['价格']))
+                        shop = '京东'
+
+            elif isinstance(item, dict) and item.get('is_chunk'):
+                chunk = item['chunk_html']
+                sku_m = re.search(r'data-sku="(\d+)"', chunk)
+                sku = sku_m.group(1) if sku_m else ''
+                t_m = re.search(r'(?:alt|title)="([^"]{3,})"', chunk)
+                title = t_m.group(1) if t_m else ''
+                p_m = re.search(r'[¥￥]\s*(\d+(\.\d+)?)', chunk) or re.search(r'class="p-price".*?(\d+\.\d+)', chunk)
+                price = p_m.group(1) if p_m else ''
+                comments = self._extract_comment_count(chunk)
+                rating = self._extract_rating(chunk)
+                shop_m = re.search(r'([^\s<>"]+?(?:旗舰店|专营店|官方店))', chunk)
+                shop = shop_m.group(1) if shop_m else '京东'
+
+            sku = sku.strip()
+            if not sku:
+                return None
+            if price: 
+                price = re.sub(r'[^\d\.]', '', str(price))
             
-            res['链接'] = f"https://item.jd.com/{res['SKU'].strip()}.html"
-            
-            return res if res['SKU'].strip() else None
+            return Product(ts, kw, page, f"\t{sku}", title, price, shop, comments, rating,
+                           f"https://item.jd.com/{sku}.html")
             
         except Exception as e:
             return None
 
     def _try_api(self):
-        try:
-            p = self.dp.listen.wait(['pc_search_searchWare', 'search', 'wareList'], timeout=2)
-            if p: 
-                return self._find_list_in_json(p.response.body)
-        except: 
-            return []
+        return self.capture.find_wares(timeout=2)
 
     def _find_list_in_json(self, data):
         if isinstance(data, dict):
@@ -313,16 +333,18 @@ class AutoPartsScraper:
 
     def _try_regex_chunks(self):
         try:
-            html = self.dp.html
-            chunks = []
-            for match in re.finditer(r'data-sku="(\d+)"', html):
-                start = match.start()
-                chunk = html[max(0, start-200): min(len(html), start+1500)]
-                chunks.append({'chunk_html': chunk, 'is_chunk': True})
-            return chunks
+            return self._split_chunks(self.dp.html)
         except: 
             return []
 
+    def _split_chunks(self, html):
+        chunks = []
+        for match in re.finditer(r'data-sku="(\d+)"', html):
+            start = match.start()
+            chunk = html[max(0, start-200): min(len(html), start+1500)]
+            chunks.append({'chunk_html': chunk, 'is_chunk': True})
+        return chunks
+
     def _next_page(self):
         try:
             btn = self.dp.ele('.pn-next', timeout=1) or self.dp.ele('text:下一页', timeout=1)
@@ -344,13 +366,9 @@ class AutoPartsScraper:
 
     def _save(self, products, filename):
         try:
-            exist = os.path.exists(filename)
-            with open(filename, 'a', encoding='utf-8-sig', newline='') as f:
-                headers = list(products[0].keys())
-                w = csv.DictWriter(f, fieldnames=headers)
-                if not exist: 
-                    w.writeheader()
-                w.writerows(products)
+            RecordWriter(filename).write(products)
+        except ValueError as e:
+            print(f"\n保存失败: {e}")
         except: 
             pass
 
@@ -365,6 +383,5 @@ class AutoPartsScraper:
             pass
 
 if __name__ == '__main__':
-    AutoPartsScraper().run()
-```
-
+    keep = input("保存原始数据存档以便离线重解析? (y/N): ").strip().lower() == 'y'
+    AutoPartsScraper(archive='采集存档_jd2.bin' if keep else None).run()
@@ -0,0 +1,58 @@
+"""
+商品记录：两个采集器与补全器共用的固定字段
+	--author:7OZP1K
+"""
+import csv, os
+from collections import namedtuple
+
+FIELDS = ('采集时间', '关键词', '页码', 'SKU', '标题', '价格', '店铺', '评论数', '评分', '链接')
+# 旧版 jd.py 把评论数写在“销量”列
+ALIASES = {'销量': '评论数'}
+
+Product = namedtuple('Product', FIELDS, defaults=('',) * len(FIELDS))
+Product.__doc__ = """商品记录(元组实现，按位置序列化)；SKU带\\t前缀，防止Excel转成科学计数"""
+
+
+def read_records(path):
+    """按表头读取CSV为Product，兼容旧列名，缺失列为空串"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = [ALIASES.get(h, h) for h in next(reader, [])]
+        pos = [header.index(name) if name in header else -1 for name in FIELDS]
+        for row in reader:
+            yield Product._make(row[i] if 0 <= i < len(row) else '' for i in pos)
+
+
+class RecordWriter:
+    """按位置批量写出Product，新文件自动写表头
+
+    追加到已有文件时按该文件的表头(经ALIASES映射)排列字段；
+    表头缺少固定字段时拒绝追加，避免数据错列。
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        # None 表示与FIELDS顺序一致，直接按位置写
+        self.order = None
+        if os.path.exists(filename) and os.path.getsize(filename):
+            with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+                header = [ALIASES.get(h, h) for h in next(csv.reader(f), [])]
+            if tuple(header) != FIELDS:
+                missing = [name for name in FIELDS if name not in header]
+                if missing:
+                    raise ValueError(f"{filename} 表头缺少字段 {missing}，不能追加")
+                self.order = [FIELDS.index(h) if h in FIELDS else -1 for h in header]
+
+    def arrange(self, record):
+        """把Product排成目标文件的列顺序"""
+        if self.order is None:
+            return record
+        return [record[i] if i >= 0 else '' for i in self.order]
+
+    def write(self, records):
+        exist = os.path.exists(self.filename) and os.path.getsize(self.filename)
+        with open(self.filename, 'a', encoding='utf-8-sig', newline='') as f:
+            w = csv.writer(f)
+            if not exist:
+                w.writerow(FIELDS)
+            w.writerows(records if self.order is None else map(self.arrange, records))
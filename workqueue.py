@@ -0,0 +1,136 @@
+"""
+关键词任务队列(SQLite租约)
+	--author:7OZP1K
+"""
+import os, socket, sqlite3, threading, time
+from contextlib import contextmanager
+
+
+class KeywordQueue:
+    """多进程/多机共享的关键词队列：领取带租约，心跳续约，过期自动回收
+
+    使用默认的回滚日志而不是WAL(WAL依赖共享内存，不能跨主机)。跨主机时库文件放在
+    共享盘上，正确性依赖该文件系统的文件锁；NFS等锁实现不可靠的共享盘不要用。
+    """
+
+    def __init__(self, db_path, lease=300, max_attempts=3):
+        self.db_path = db_path
+        self.lease = lease
+        # 领取次数达到上限仍未完成的关键词标记为failed，不再分配
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS keywords (
+                    keyword     TEXT PRIMARY KEY,
+                    status      TEXT NOT NULL DEFAULT 'pending',
+                    worker      TEXT,
+                    lease_until REAL,
+                    attempts    INTEGER NOT NULL DEFAULT 0,
+                    done_at     REAL
+                )""")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def add(self, keywords):
+        """导入关键词，已存在的不会重复导入"""
+        with self._connect() as conn:
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO keywords (keyword) VALUES (?)",
+                [(k,) for k in keywords])
+            return cur.rowcount
+
+    def claim(self, worker):
+        """领取一个待处理或租约已过期的关键词"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute("""
+                    UPDATE keywords SET status = 'failed', worker = NULL, lease_until = NULL
+                    WHERE attempts >= ?
+                        AND (status = 'pending' OR (status = 'leased' AND lease_until < ?))""",
+                    (self.max_attempts, now))
+                row = conn.execute("""
+                    SELECT keyword FROM keywords
+                    WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?)
+                    ORDER BY attempts, rowid LIMIT 1""", (now,)).fetchone()
+                if row:
+                    conn.execute("""
+                        UPDATE keywords SET status = 'leased', worker = ?, lease_until = ?,
+                            attempts = attempts + 1
+                        WHERE keyword = ?""", (worker, now + self.lease, row[0]))
+                conn.execute('COMMIT')
+            except:
+                conn.execute('ROLLBACK')
+                raise
+            return row[0] if row else None
+
+    def heartbeat(self, keyword, worker):
+        """续约，返回False表示租约已丢失(被其他节点回收)"""
+        with self._connect() as conn:
+            cur = conn.execute("""
+                UPDATE keywords SET lease_until = ?
+                WHERE keyword = ? AND worker = ? AND status = 'leased'""",
+                (time.time() + self.lease, keyword, worker))
+            return cur.rowcount == 1
+
+    def complete(self, keyword, worker):
+        """标记完成，只有持有租约的节点能成功一次"""
+        with self._connect() as conn:
+            cur = conn.execute("""
+                UPDATE keywords SET status = 'done', lease_until = NULL, done_at = ?
+                WHERE keyword = ? AND worker = ? AND status = 'leased'""",
+                (time.time(), keyword, worker))
+            return cur.rowcount == 1
+
+    def release(self, keyword, worker, refund=False):
+        """主动归还，让其他节点立即领取
+
+        refund=True 表示人为中断(如Ctrl+C)，退还本次领取计数，不计入失败次数。
+        """
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE keywords SET status = 'pending', worker = NULL, lease_until = NULL,
+                    attempts = MAX(attempts - ?, 0)
+                WHERE keyword = ? AND worker = ? AND status = 'leased'""",
+                (1 if refund else 0, keyword, worker))
+
+    def stats(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM keywords GROUP BY status").fetchall())
+
+
+class LeaseHeartbeat(threading.Thread):
+    """后台心跳线程，采集期间定期续约"""
+
+    def __init__(self, queue, keyword, worker, interval=None):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.keyword = keyword
+        self.worker = worker
+        self.interval = interval or max(1, queue.lease / 3)
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.keyword, self.worker):
+                    self.lost = True
+                    return
+            except:
+                pass
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"